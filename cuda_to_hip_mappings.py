@@ -574,8 +574,8 @@ CUDA_IDENTIFIER_MAP = {
      "CU_GRAPHICS_MAP_RESOURCE_FLAGS_NONE": ("hipGraphicsMapFlagsNone", CONV_TYPE, API_DRIVER,HIP_UNSUPPORTED),
      "CU_GRAPHICS_MAP_RESOURCE_FLAGS_READ_ONLY": ("hipGraphicsMapFlagsReadOnly", CONV_TYPE, API_DRIVER,HIP_UNSUPPORTED),
      "CU_GRAPHICS_MAP_RESOURCE_FLAGS_WRITE_DISCARD": ("hipGraphicsMapFlagsWriteDiscard", CONV_TYPE, API_DRIVER,HIP_UNSUPPORTED),
-     "CU_GRAPHICS_MAP_RESOURCE_FLAGS_NONE": ("hipGraphicsRegisterFlagsNone", CONV_TYPE, API_DRIVER,HIP_UNSUPPORTED),
-     "CU_GRAPHICS_MAP_RESOURCE_FLAGS_READ_ONLY": ("hipGraphicsRegisterFlagsReadOnly", CONV_TYPE, API_DRIVER,HIP_UNSUPPORTED),
+     "CU_GRAPHICS_REGISTER_FLAGS_NONE": ("hipGraphicsRegisterFlagsNone", CONV_TYPE, API_DRIVER,HIP_UNSUPPORTED),
+     "CU_GRAPHICS_REGISTER_FLAGS_READ_ONLY": ("hipGraphicsRegisterFlagsReadOnly", CONV_TYPE, API_DRIVER,HIP_UNSUPPORTED),
      "CU_GRAPHICS_REGISTER_FLAGS_WRITE_DISCARD": ("hipGraphicsRegisterFlagsWriteDiscard", CONV_TYPE, API_DRIVER,HIP_UNSUPPORTED),
      "CU_GRAPHICS_REGISTER_FLAGS_SURFACE_LDST": ("hipGraphicsRegisterFlagsSurfaceLoadStore", CONV_TYPE, API_DRIVER,HIP_UNSUPPORTED),
      "CU_GRAPHICS_REGISTER_FLAGS_TEXTURE_GATHER": ("hipGraphicsRegisterFlagsTextureGather", CONV_TYPE, API_DRIVER,HIP_UNSUPPORTED),
@@ -637,7 +637,6 @@ CUDA_IDENTIFIER_MAP = {
      "CU_LIMIT_MALLOC_HEAP_SIZE": ("hipLimitMallocHeapSize", CONV_TYPE,API_DRIVER),
      "CU_LIMIT_DEV_RUNTIME_SYNC_DEPTH": ("hipLimitDevRuntimeSyncDepth", CONV_TYPE, API_DRIVER,HIP_UNSUPPORTED),
      "CU_LIMIT_DEV_RUNTIME_PENDING_LAUNCH_COUNT": ("hipLimitDevRuntimePendingLaunchCount", CONV_TYPE, API_DRIVER,HIP_UNSUPPORTED),
-     "CU_LIMIT_STACK_SIZE": ("hipLimitStackSize", CONV_TYPE, API_DRIVER, HIP_UNSUPPORTED),
      "CU_MEM_ATTACH_GLOBAL": ("hipMemAttachGlobal", CONV_TYPE, API_DRIVER,HIP_UNSUPPORTED),
      "CU_MEM_ATTACH_HOST": ("hipMemAttachHost", CONV_TYPE, API_DRIVER,HIP_UNSUPPORTED),
      "CU_MEM_ATTACH_SINGLE": ("hipMemAttachSingle", CONV_TYPE, API_DRIVER,HIP_UNSUPPORTED),
@@ -778,7 +777,6 @@ CUDA_IDENTIFIER_MAP = {
      "cuParamSetf": ("hipParamSetf", CONV_MODULE, API_DRIVER, HIP_UNSUPPORTED),
      "cuParamSeti": ("hipParamSeti", CONV_MODULE, API_DRIVER, HIP_UNSUPPORTED),
      "cuParamSetSize": ("hipParamSetSize", CONV_MODULE, API_DRIVER, HIP_UNSUPPORTED),
-     "cuParamSetSize": ("hipParamSetSize", CONV_MODULE, API_DRIVER, HIP_UNSUPPORTED),
      "cuParamSetv": ("hipParamSetv", CONV_MODULE, API_DRIVER, HIP_UNSUPPORTED),
      "cuOccupancyMaxActiveBlocksPerMultiprocessor": ("hipOccupancyMaxActiveBlocksPerMultiprocessor", CONV_OCCUPANCY,API_DRIVER),
      "cuOccupancyMaxActiveBlocksPerMultiprocessorWithFlags": ("hipOccupancyMaxActiveBlocksPerMultiprocessorWithFlags", CONV_OCCUPANCY, API_DRIVER,HIP_UNSUPPORTED),
@@ -1422,10 +1420,6 @@ CUDA_IDENTIFIER_MAP = {
      "cudaGLDeviceListAll": ("HIP_GL_DEVICE_LIST_ALL", CONV_GL, API_RUNTIME,HIP_UNSUPPORTED),
      "cudaGLDeviceListCurrentFrame": ("HIP_GL_DEVICE_LIST_CURRENT_FRAME", CONV_GL, API_RUNTIME,HIP_UNSUPPORTED),
      "cudaGLDeviceListNextFrame": ("HIP_GL_DEVICE_LIST_NEXT_FRAME", CONV_GL, API_RUNTIME,HIP_UNSUPPORTED),
-     "cudaGLGetDevices": ("hipGLGetDevices", CONV_GL, API_RUNTIME,HIP_UNSUPPORTED),
-     "cudaGraphicsGLRegisterBuffer": ("hipGraphicsGLRegisterBuffer", CONV_GL, API_RUNTIME,HIP_UNSUPPORTED),
-     "cudaGraphicsGLRegisterImage": ("hipGraphicsGLRegisterImage", CONV_GL, API_RUNTIME,HIP_UNSUPPORTED),
-     "cudaWGLGetDevice": ("hipWGLGetDevice", CONV_GL, API_RUNTIME,HIP_UNSUPPORTED),
      "cudaGLMapFlagsNone": ("HIP_GL_MAP_RESOURCE_FLAGS_NONE", CONV_GL, API_RUNTIME,HIP_UNSUPPORTED),
      "cudaGLMapFlagsReadOnly": ("HIP_GL_MAP_RESOURCE_FLAGS_READ_ONLY", CONV_GL, API_RUNTIME,HIP_UNSUPPORTED),
      "cudaGLMapFlagsWriteDiscard": ("HIP_GL_MAP_RESOURCE_FLAGS_WRITE_DISCARD", CONV_GL, API_RUNTIME,HIP_UNSUPPORTED),
@@ -1445,7 +1439,6 @@ CUDA_IDENTIFIER_MAP = {
      "cudaD3D9GetDirect3DDevice": ("hipD3D9GetDirect3DDevice", CONV_D3D9, API_RUNTIME,HIP_UNSUPPORTED),
      "cudaD3D9SetDirect3DDevice": ("hipD3D9SetDirect3DDevice", CONV_D3D9, API_RUNTIME,HIP_UNSUPPORTED),
      "cudaGraphicsD3D9RegisterResource": ("hipGraphicsD3D9RegisterResource", CONV_D3D9, API_RUNTIME,HIP_UNSUPPORTED),
-     "cudaD3D9MapFlags": ("hipD3D9MapFlags", CONV_D3D9, API_RUNTIME,HIP_UNSUPPORTED),
      "cudaD3D9MapFlagsNone": ("HIP_D3D9_MAPRESOURCE_FLAGS_NONE", CONV_D3D9, API_RUNTIME,HIP_UNSUPPORTED),
      "cudaD3D9MapFlagsReadOnly": ("HIP_D3D9_MAPRESOURCE_FLAGS_READONLY", CONV_D3D9, API_RUNTIME,HIP_UNSUPPORTED),
      "cudaD3D9MapFlagsWriteDiscard": ("HIP_D3D9_MAPRESOURCE_FLAGS_WRITEDISCARD", CONV_D3D9, API_RUNTIME,HIP_UNSUPPORTED),
@@ -1490,9 +1483,6 @@ CUDA_IDENTIFIER_MAP = {
      "cudaD3D11GetDevice": ("hipD3D11GetDevice", CONV_D3D11, API_RUNTIME,HIP_UNSUPPORTED),
      "cudaD3D11GetDevices": ("hipD3D11GetDevices", CONV_D3D11, API_RUNTIME,HIP_UNSUPPORTED),
      "cudaGraphicsD3D11RegisterResource": ("hipGraphicsD3D11RegisterResource", CONV_D3D11, API_RUNTIME,HIP_UNSUPPORTED),
-     "cudaD3D11GetDevice": ("hipD3D11GetDevice", CONV_D3D11, API_RUNTIME,HIP_UNSUPPORTED),
-     "cudaD3D11GetDevices": ("hipD3D11GetDevices", CONV_D3D11, API_RUNTIME,HIP_UNSUPPORTED),
-     "cudaGraphicsD3D11RegisterResource": ("hipGraphicsD3D11RegisterResource", CONV_D3D11, API_RUNTIME,HIP_UNSUPPORTED),
      "cudaGraphicsVDPAURegisterOutputSurface": ("hipGraphicsVDPAURegisterOutputSurface", CONV_VDPAU, API_RUNTIME,HIP_UNSUPPORTED),
      "cudaGraphicsVDPAURegisterVideoSurface": ("hipGraphicsVDPAURegisterVideoSurface", CONV_VDPAU, API_RUNTIME,HIP_UNSUPPORTED),
      "cudaVDPAUGetDevice": ("hipVDPAUGetDevice", CONV_VDPAU, API_RUNTIME,HIP_UNSUPPORTED),
@@ -1757,10 +1747,6 @@ CUDA_IDENTIFIER_MAP = {
      "cublasDgetrsBatched": ("hipblasDgetrsBatched", CONV_MATH_FUNC, API_BLAS, HIP_UNSUPPORTED),
      "cublasCgetrsBatched": ("hipblasCgetrsBatched", CONV_MATH_FUNC, API_BLAS, HIP_UNSUPPORTED),
      "cublasZgetrsBatched": ("hipblasZgetrsBatched", CONV_MATH_FUNC, API_BLAS, HIP_UNSUPPORTED),
-     "cublasStrsmBatched": ("hipblasStrsmBatched", CONV_MATH_FUNC, API_BLAS, HIP_UNSUPPORTED),
-     "cublasDtrsmBatched": ("hipblasDtrsmBatched", CONV_MATH_FUNC, API_BLAS, HIP_UNSUPPORTED),
-     "cublasCtrsmBatched": ("hipblasCtrsmBatched", CONV_MATH_FUNC, API_BLAS, HIP_UNSUPPORTED),
-     "cublasZtrsmBatched": ("hipblasZtrsmBatched", CONV_MATH_FUNC, API_BLAS, HIP_UNSUPPORTED),
      "cublasSmatinvBatched": ("hipblasSmatinvBatched", CONV_MATH_FUNC, API_BLAS, HIP_UNSUPPORTED),
      "cublasDmatinvBatched": ("hipblasDmatinvBatched", CONV_MATH_FUNC, API_BLAS, HIP_UNSUPPORTED),
      "cublasCmatinvBatched": ("hipblasCmatinvBatched", CONV_MATH_FUNC, API_BLAS, HIP_UNSUPPORTED),
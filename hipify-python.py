@@ -3,21 +3,80 @@
 
 import argparse
 import constants
+import hashlib
+import json
+import mmap
+import multiprocessing
+import multiprocessing.pool
 import re
 import shutil
+import subprocess
 import sys
 import os
+import tempfile
 import yaml
 
-from functools import reduce
+from functools import partial, reduce
 from cuda_to_hip_mappings import CUDA_TO_HIP_MAPPINGS
 
+# pyahocorasick is optional. When present, all CUDA tokens are located with one automaton scan.
+try:
+    import ahocorasick
+except ImportError:
+    ahocorasick = None
+
+# Flatten the mappings once so every file is rewritten in a single pass.
+TOKEN_MAP = {}
+UNSUPPORTED = set()
+for mapping in CUDA_TO_HIP_MAPPINGS:
+    for cuda_type, value in mapping.items():
+        TOKEN_MAP.setdefault(cuda_type, value[0])
+        if constants.HIP_UNSUPPORTED in value[1:]:
+            UNSUPPORTED.add(cuda_type)
+
+def token_pattern(keys):
+    """Builds the word bounded alternation matching any of keys."""
+    # Longest keys first so that the alternation prefers e.g. cudaMemcpyAsync over cudaMemcpy.
+    return re.compile(r'\b(%s)\b' % "|".join(re.escape(key) for key in sorted(keys, key=len, reverse=True)))
+
+# Most keys are plain identifiers, which can only match a whole word of the source.
+IDENTIFIER_RE = re.compile(r'\w+')
+IDENTIFIER_KEYS = frozenset(key for key in TOKEN_MAP if re.match(r'\w+$', key))
+OTHER_KEYS = [key for key in TOKEN_MAP if key not in IDENTIFIER_KEYS]
+
+if ahocorasick is not None:
+    AUTOMATON = ahocorasick.Automaton()
+    for cuda_type in TOKEN_MAP:
+        AUTOMATON.add_word(cuda_type, cuda_type)
+    AUTOMATON.make_automaton()
+else:
+    AUTOMATON = None
+
+# Identifies conversions in the cache directory, which are stale once the mappings or this script change.
+_cache_version = hashlib.sha1(repr([sorted(mapping.items()) for mapping in CUDA_TO_HIP_MAPPINGS]).encode("utf-8"))
+with open(os.path.abspath(__file__), "rb") as _script:
+    _cache_version.update(_script.read())
+CACHE_VERSION = _cache_version.hexdigest()[:16]
+
+# Every file that needs converting contains one of these: kernel launches, the detail:: joins
+# done by processKernelLaunches, and the keys which do not mention cu/CU themselves.
+CUDA_MARKERS = ("cu", "CU", "<<<", "detail") + tuple(key for key in TOKEN_MAP if "cu" not in key and "CU" not in key)
+
+# Patterns used while rewriting kernel launches, disabling asserts and scanning kernel definitions.
+DETAIL_NAMESPACE_RE = re.compile(r'([ ]+)(detail+)::[ ]+\\\n[ ]+')
+ASSERT_RE = re.compile(r"\bassert[ ]*\(")
+KERNEL_DEFINITION_RE = re.compile(r"(template[ ]*<(.*)>\n.*\n?)?__global__ void[\n| ](\w+(\(.*\))?)\(")
+
 def openf(filename, mode):
    if sys.version_info[0] == 3:
       return open(filename, mode, errors='ignore')
    else:
       return open(filename, mode)
 
+# Trees with fewer files than this are preprocessed by a pool of THREAD_POOL_SIZE threads.
+PROCESS_POOL_MIN_FILES = 100
+THREAD_POOL_SIZE = 16
+
 # Color coding for printing
 class bcolors:
     HEADER = '\033[95m'
@@ -30,6 +89,10 @@ class bcolors:
     UNDERLINE = '\033[4m'
 
 
+# The last progress bar written, so that identical redraws can be skipped.
+_last_progress_text = None
+
+
 def update_progress_bar(total, progress):
     """
     Displays and updates a console progress bar.
@@ -45,6 +108,12 @@ def update_progress_bar(total, progress):
         "#" * block + "-" * (barLength - block), round(progress * 100, 0),
         status)
 
+    # Nothing changed since the last redraw.
+    global _last_progress_text
+    if text == _last_progress_text:
+        return
+    _last_progress_text = text
+
     # Send the progress to stdout.
     sys.stdout.write(text)
 
@@ -52,9 +121,53 @@ def update_progress_bar(total, progress):
     sys.stdout.flush()
 
 
-def filename_ends_with_extension(filename, extensions):
-    """Helper method to see if filename ends with certain extension"""
-    return reduce(lambda result, ext: filename.endswith("." + ext) or result, extensions, False)
+def extension_suffixes(extensions):
+    """Helper method to turn ['cu', 'cuh', ..] into the ('.cu', '.cuh', ..) tuple accepted by str.endswith"""
+    return tuple("." + ext for ext in extensions)
+
+
+def is_word_boundary(string, pos):
+    """Helper method mirroring the regex \\b assertion at string[pos]"""
+    before = pos > 0 and (string[pos - 1].isalnum() or string[pos - 1] == "_")
+    after = pos < len(string) and (string[pos].isalnum() or string[pos] == "_")
+    return before != after
+
+
+def find_cuda_tokens(string):
+    """
+    Returns the (start, end, cuda_type) spans of all CUDA tokens in string.
+
+    A token is a key of TOKEN_MAP with a word boundary on both sides. Tokens never overlap: scanning
+    left to right, the earliest token wins, and of those starting there the longest one.
+    """
+    if AUTOMATON is None:
+        # Only search for the keys that actually occur in this file.
+        keys = set(IDENTIFIER_KEYS.intersection(IDENTIFIER_RE.findall(string)))
+        keys.update(key for key in OTHER_KEYS if key in string)
+        if not keys:
+            return []
+        return [(match.start(), match.end(), match.group(0)) for match in token_pattern(keys).finditer(string)]
+
+    # Keep the word bounded candidates, then resolve overlaps leftmost-longest.
+    candidates = []
+    for end, cuda_type in AUTOMATON.iter(string):
+        start = end - len(cuda_type) + 1
+        if is_word_boundary(string, start) and is_word_boundary(string, end + 1):
+            candidates.append((start, end + 1, cuda_type))
+    candidates.sort(key=lambda token: (token[0], -token[1]))
+
+    tokens = []
+    last_end = 0
+    for token in candidates:
+        if token[0] >= last_end:
+            tokens.append(token)
+            last_end = token[1]
+    return tokens
+
+
+def escape_replacement(string):
+    """Helper method to use string literally as a re.sub replacement"""
+    return string.replace("\\", "\\\\")
 
 
 def inside_included_directories(dirpath, rootpath, include_dirs):
@@ -62,7 +175,40 @@ def inside_included_directories(dirpath, rootpath, include_dirs):
     return reduce(lambda result, included_directory: re.match(r'(%s)\b' % os.path.join(rootpath, included_directory), dirpath) or result, include_dirs, None)
 
 
-def walk_over_directory(rootpath, extensions, show_detailed=False, include_dirs=None):
+def iter_files(rootpath, suffixes, include_dirs):
+    """
+    Recursively yields the files under rootpath ending with one of suffixes.
+
+    Only files in directories accepted by inside_included_directories are yielded.
+    Like os.walk, symlinked directories are not followed.
+    """
+    # os.scandir can be used in a with statement from Python 3.6 on.
+    if sys.version_info < (3, 6):
+        for (dirpath, _dirnames, filenames) in os.walk(rootpath):
+            if inside_included_directories(dirpath, rootpath, include_dirs):
+                for filename in filenames:
+                    if filename.endswith(suffixes):
+                        yield os.path.join(dirpath, filename)
+        return
+
+    directories = [rootpath]
+    while directories:
+        dirpath = directories.pop()
+        included = inside_included_directories(dirpath, rootpath, include_dirs)
+        try:
+            with os.scandir(dirpath) as entries:
+                for entry in entries:
+                    if entry.is_dir():
+                        if not entry.is_symlink():
+                            directories.append(entry.path)
+                    elif included and entry.name.endswith(suffixes):
+                        yield entry.path
+        except OSError:
+            # Skip directories that cannot be listed, as os.walk does.
+            continue
+
+
+def walk_over_directory(rootpath, extensions, show_detailed=False, include_dirs=None, cache_directory=None):
     """
     Recursively walk over directory and call preprocessor on selected files.
 
@@ -72,6 +218,8 @@ def walk_over_directory(rootpath, extensions, show_detailed=False, include_dirs=
         include_dirs - Directories under the rootpath that should be included in the walk.
 
         show_detailed - Show a detailed summary of the transpilation process.
+
+        cache_directory - Directory reusing conversions of unchanged files across runs.
     """
 
 
@@ -79,47 +227,77 @@ def walk_over_directory(rootpath, extensions, show_detailed=False, include_dirs=
     if include_dirs is None:
         include_dirs = []
 
-    # Compute the total number of files to be traversed.
-    total_files = 0
-    for (dirpath, _dirnames, filenames) in os.walk(rootpath):
-        if inside_included_directories(dirpath, rootpath, include_dirs):
-            for filename in filenames:
-                total_files += filename_ends_with_extension(filename, extensions)
+    # Collect the files to be traversed.
+    filepaths = list(iter_files(rootpath, extension_suffixes(extensions), include_dirs))
+    total_files = len(filepaths)
 
-    current_file = 0
+    # Redraw the progress bar at most ~100 times.
+    progress_step = max(1, total_files // 100)
 
     # Preprocessing statistics.
-    stats = {"unsupported_calls": [], "kernel_launches": []}
-
-    # Begin traversing the files.
-    for (dirpath, _dirnames, filenames) in os.walk(rootpath, topdown=True):
-        # Check if file ends with a valid extensions
-        if not inside_included_directories(dirpath, rootpath, include_dirs):
-            continue
+    stats = new_stats()
 
-        for filename in filenames:
-            if filename_ends_with_extension(filename, extensions):
-                # Construct the file's full path
-                filepath = os.sep.join([dirpath, filename])
-
-                # Execute the preprocessor on the specified file.
-                preprocessor(filepath, stats)
+    # Each file is independent, so preprocess them across all cores. Small trees are not
+    # worth starting worker processes for; threads still overlap the file reads and writes.
+    if total_files < PROCESS_POOL_MIN_FILES:
+        pool = multiprocessing.pool.ThreadPool(THREAD_POOL_SIZE)
+        chunksize = 1
+    else:
+        workers = multiprocessing.cpu_count()
+        pool = multiprocessing.Pool(workers)
+
+        # About four chunks per worker keeps every core busy while batching the pickling.
+        chunksize = max(1, total_files // (workers * 4))
+
+    # Batch the files by hand: imap's own chunking hides the iterator whose next() accepts a timeout.
+    batches = [filepaths[start:start + chunksize] for start in range(0, total_files, chunksize)]
+    try:
+        results = pool.imap(partial(preprocess_files, cache_directory=cache_directory), batches)
+        current_file = 0
+        for _batch in batches:
+            for (filepath, file_stats) in next_result(results):
+                # Merge the file's statistics
+                merge_stats(stats, file_stats)
 
                 # Update the progress
-                print(os.path.join(dirpath, filename))
-                update_progress_bar(total_files, current_file)
-
+                if show_detailed:
+                    print(filepath)
+                if current_file % progress_step == 0 or current_file == total_files - 1:
+                    update_progress_bar(total_files, current_file)
                 current_file += 1
+    except BaseException:
+        # Stop the workers outright; join() could wait forever on a task lost to an interrupt.
+        pool.terminate()
+        raise
+    else:
+        pool.close()
+        pool.join()
 
     print(bcolors.OKGREEN + "Successfully preprocessed all matching files." + bcolors.ENDC)
 
     # Show detailed summary
     if show_detailed:
-        compute_stats(stats, show_detailed)
+        compute_stats(stats)
+
+
+def new_stats():
+    """ Returns empty preprocessing statistics.
+
+    unsupported_calls - The set of unsupported CUDA calls encountered.
+
+    kernel_launches - The number of replaced kernel launches.
+    """
+    return {"unsupported_calls": set(), "kernel_launches": 0}
+
+
+def merge_stats(stats, file_stats):
+    """ Merges the statistics of a single file into stats. """
+    stats["unsupported_calls"].update(file_stats["unsupported_calls"])
+    stats["kernel_launches"] += file_stats["kernel_launches"]
 
 
 def compute_stats(stats):
-    unsupported_calls = set(cuda_call for (cuda_call, _filepath) in stats["unsupported_calls"])
+    unsupported_calls = stats["unsupported_calls"]
 
     # Print the number of unsupported calls
     print("Total number of unsupported CUDA function calls: %d" % (len(unsupported_calls)))
@@ -128,12 +306,12 @@ def compute_stats(stats):
     print(", ".join(unsupported_calls))
 
     # Print the number of kernel launches
-    print("\nTotal number of replaced kernel launches: %d" % (len(stats["kernel_launches"])))
+    print("\nTotal number of replaced kernel launches: %d" % (stats["kernel_launches"]))
 
 def processKernelLaunches(string, stats):
     """ Replace the CUDA style Kernel launches with the HIP style kernel launches."""
     # Concat the namespace with the kernel names. (Find cleaner way of doing this later).
-    string = re.sub(r'([ ]+)(detail+)::[ ]+\\\n[ ]+', lambda inp: "%s%s::" % (inp.group(1), inp.group(2)), string)
+    string = DETAIL_NAMESPACE_RE.sub(r"\1\2::", string)
 
     def grab_method_and_template(in_kernel):
         # The positions for relevant kernel components.
@@ -200,32 +378,50 @@ def processKernelLaunches(string, stats):
         kernel_end = 0
         kernel_positions = []
 
+        # Get kernel starting position (starting from the previous ending point)
+        kernel_start = string.find("<<<", kernel_end)
+
         # Continue until we cannot find any more kernels anymore.
-        while string.find("<<<", kernel_end) != -1:
-            # Get kernel starting position (starting from the previous ending point)
-            kernel_start = string.find("<<<", kernel_end)
+        while kernel_start != -1:
+            # Get kernel ending position, stopping at an unterminated launch.
+            kernel_end = string.find(">>>", kernel_start)
+            if kernel_end == -1:
+                break
 
-            # Get kernel ending position (adjust end point past the >>>)
-            kernel_end = string.find(">>>", kernel_start) + 3
+            # Adjust end point past the >>>
+            kernel_end += 3
 
             # Add to list of traversed kernels
             kernel_positions.append({"start": kernel_start, "end": kernel_end, "group": string[kernel_start: kernel_end]})
 
+            kernel_start = string.find("<<<", kernel_end)
+
         return kernel_positions
 
 
     # Grab positional ranges of all kernel launchces
     get_kernel_positions = [k for k in find_kernel_bounds(string)]
-    output_string = string
+
+    # Pieces of the output string, joined once at the end.
+    output_pieces = []
+    last_end = 0
 
     # Replace each CUDA kernel with a HIP kernel.
     for kernel in get_kernel_positions:
         # Get kernel components
         params = grab_method_and_template(kernel)
 
+        # No kernel name precedes the launch.
+        if params is None:
+            continue
+
         # Find paranthesis after kernel launch
         paranthesis = string.find("(", kernel["end"])
 
+        # Skip launches without arguments or overlapping the previous one.
+        if paranthesis == -1 or params[0]["start"] < last_end:
+            continue
+
         # Extract cuda kernel
         cuda_kernel = string[params[0]["start"]:paranthesis+1]
 
@@ -236,12 +432,15 @@ def processKernelLaunches(string, stats):
         hip_kernel = "hipLaunchKernelGGL(" + cuda_kernel[0:-1].replace(">>>", ", 0"*(4-num_klp) + ">>>").replace("<<<", ", ").replace(">>>", ", ")
 
         # Replace cuda kernel with hip kernel
-        output_string = output_string.replace(cuda_kernel, hip_kernel)
+        output_pieces.append(string[last_end:params[0]["start"]])
+        output_pieces.append(hip_kernel)
+        last_end = paranthesis + 1
 
         # Update the statistics
-        stats["kernel_launches"].append(hip_kernel)
+        stats["kernel_launches"] += 1
 
-    return output_string
+    output_pieces.append(string[last_end:])
+    return "".join(output_pieces)
 
 
 def find_paranthesis_end(input_string, start):
@@ -273,13 +472,26 @@ def disable_asserts(input_string):
     """ Disables regular assert statements
     e.g. "assert(....)" -> "/*assert(....)*/"
     """
-    output_string = input_string
-    asserts = list(re.finditer(r"\bassert[ ]*\(", input_string))
-    for assert_item in asserts:
-        p_start, p_end = find_paranthesis_end(input_string, assert_item.end()-1)
+    # Most files have no asserts at all.
+    if "assert" not in input_string:
+        return input_string
+
+    output_pieces = []
+    last_end = 0
+    for assert_item in ASSERT_RE.finditer(input_string):
         start = assert_item.start()
-        output_string = output_string.replace(input_string[start:p_end+1], "")
-    return output_string
+
+        # Skip asserts nested in a removed one, and unbalanced ones.
+        if start < last_end:
+            continue
+        p_start, p_end = find_paranthesis_end(input_string, assert_item.end()-1)
+        if p_end is None:
+            continue
+
+        output_pieces.append(input_string[last_end:start])
+        last_end = p_end + 1
+    output_pieces.append(input_string[last_end:])
+    return "".join(output_pieces)
 
 
 def disable_function(input_string, function, replace_style):
@@ -428,48 +640,139 @@ def disable_function(input_string, function, replace_style):
     return output_string
 
 
-def preprocessor(filepath, stats):
-    """ Executes the CUDA -> HIP conversion on the specified file. """
-    with openf(filepath, "r+") as fileobj:
-        output_source = fileobj.read()
+def read_source(filepath):
+    """ Reads a source file through a read-only memory map. """
+    with open(filepath, "rb") as fileobj:
+        # Empty files cannot be mapped.
+        if os.fstat(fileobj.fileno()).st_size == 0:
+            return ""
+
+        source = mmap.mmap(fileobj.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            return source[:].decode("utf-8", "ignore")
+        finally:
+            source.close()
 
-        # Perform type, method, constant replacements
-        for mapping in CUDA_TO_HIP_MAPPINGS:
-            for cuda_type, value in mapping.items():
-                # Extract relevant information
-                hip_type = value[0]
-                meta_data = value[1:]
 
-                if output_source.find(cuda_type) > -1:
-                    # Check if supported
-                    if constants.HIP_UNSUPPORTED in meta_data:
-                        stats["unsupported_calls"].append((cuda_type, filepath))
+def hipify_source(filepath, input_source, stats):
+    """ Returns the HIP version of input_source, the contents of filepath. """
+    output_source = input_source
 
-                if cuda_type in output_source:
-                    output_source = re.sub(r'\b(%s)\b' % re.escape(cuda_type), lambda x: hip_type, output_source)
+    # Files without any CUDA marker only need their asserts disabled.
+    if any(marker in input_source for marker in CUDA_MARKERS):
+        # Perform type, method, constant replacements
+        pieces = []
+        last_end = 0
+        for start, end, cuda_type in find_cuda_tokens(input_source):
+            # Check if supported
+            if cuda_type in UNSUPPORTED:
+                stats["unsupported_calls"].add(cuda_type)
+
+            pieces.append(input_source[last_end:start])
+            pieces.append(TOKEN_MAP[cuda_type])
+            last_end = end
+        pieces.append(input_source[last_end:])
+        output_source = "".join(pieces)
 
         # Perform Kernel Launch Replacements
         output_source = processKernelLaunches(output_source, stats)
 
-        # Disable asserts
-        if not filepath.endswith("THCGeneral.h.in"):
-            output_source = disable_asserts(output_source)
+    # Disable asserts
+    if not filepath.endswith("THCGeneral.h.in"):
+        output_source = disable_asserts(output_source)
 
-        # Overwrite file contents
-        fileobj.seek(0)
-        fileobj.write(output_source)
-        fileobj.truncate()
-        fileobj.flush()
+    return output_source
 
-        # Flush to disk
-        os.fsync(fileobj)
+
+def cached_hipify_source(filepath, input_source, stats, cache_directory):
+    """ Runs hipify_source through an on-disk cache keyed by the source contents and CACHE_VERSION. """
+    key = hashlib.sha1(input_source.encode("utf-8")).hexdigest()
+
+    # THCGeneral.h.in keeps its asserts, so the same contents convert differently.
+    if filepath.endswith("THCGeneral.h.in"):
+        key += "-asserts"
+    cache_path = os.path.join(cache_directory, "%s-%s.json" % (CACHE_VERSION, key))
+
+    # Reuse the previous conversion along with its statistics. Missing or corrupt entries are misses.
+    try:
+        with open(cache_path, "r") as cache_file:
+            entry = json.load(cache_file)
+        output_source = entry["source"]
+        cached_stats = new_stats()
+        merge_stats(cached_stats, entry["stats"])
+    except (IOError, OSError, ValueError, KeyError, TypeError):
+        pass
+    else:
+        merge_stats(stats, cached_stats)
+        return output_source
+
+    file_stats = new_stats()
+    output_source = hipify_source(filepath, input_source, file_stats)
+    merge_stats(stats, file_stats)
+
+    # Write to a private file first so that concurrent workers, threads included, never see a partial entry.
+    file_stats["unsupported_calls"] = sorted(file_stats["unsupported_calls"])
+    temp_fd, temp_path = tempfile.mkstemp(suffix=".tmp", dir=cache_directory)
+    with os.fdopen(temp_fd, "w") as cache_file:
+        json.dump({"source": output_source, "stats": file_stats}, cache_file)
+    try:
+        # os.replace is missing on Python 2, where os.rename still overwrites on POSIX.
+        getattr(os, "replace", os.rename)(temp_path, cache_path)
+    except OSError:
+        # Another worker stored the same entry first.
+        os.remove(temp_path)
+
+    return output_source
+
+
+def preprocessor(filepath, stats, cache_directory=None):
+    """ Executes the CUDA -> HIP conversion on the specified file.
+
+    cache_directory - Optional directory of conversions from previous runs, keyed by file contents.
+    """
+    input_source = read_source(filepath)
+
+    if cache_directory:
+        output_source = cached_hipify_source(filepath, input_source, stats, cache_directory)
+    else:
+        output_source = hipify_source(filepath, input_source, stats)
+
+    # Overwrite file contents, leaving untouched files alone.
+    if output_source != input_source:
+        with open(filepath, "wb") as fileobj:
+            fileobj.write(output_source.encode("utf-8"))
+
+
+def preprocess_file(filepath, cache_directory=None):
+    """ Runs the preprocessor on a single file and returns the statistics it gathered. """
+    stats = new_stats()
+    try:
+        preprocessor(filepath, stats, cache_directory)
+    except KeyboardInterrupt:
+        # A pool worker dies on KeyboardInterrupt and its result never arrives. Report it as a failure instead.
+        raise RuntimeError("Interrupted while preprocessing %s" % filepath)
+    return filepath, stats
+
+
+def preprocess_files(filepaths, cache_directory=None):
+    """ Runs the preprocessor on a batch of files and returns the statistics of each. """
+    return [preprocess_file(filepath, cache_directory) for filepath in filepaths]
+
+
+def next_result(results):
+    """ Waits for the next pool result, polling so that Ctrl-C still interrupts the wait. """
+    while True:
+        try:
+            return results.next(timeout=1)
+        except multiprocessing.TimeoutError:
+            pass
 
 
 def file_specific_replacement(filepath, search_string, replace_string, strict = False):
     with openf(filepath, "r+") as f:
         contents = f.read()
         if strict:
-            contents = re.sub(r'\b(%s)\b' % search_string, lambda x: replace_string, contents)
+            contents = re.sub(r'\b(%s)\b' % search_string, escape_replacement(replace_string), contents)
         else:
             contents = contents.replace(search_string, replace_string)
         f.seek(0)
@@ -505,7 +808,7 @@ def get_kernel_template_params(the_file, KernelDictionary):
         # Extract all kernels with their templates inside of the file
         string = f.read()
 
-        get_kernel_definitions = [k for k in re.finditer(r"(template[ ]*<(.*)>\n.*\n?)?__global__ void[\n| ](\w+(\(.*\))?)\(", string)]
+        get_kernel_definitions = [k for k in KERNEL_DEFINITION_RE.finditer(string)]
 
         # Create new launch syntax
         for kernel in get_kernel_definitions:
@@ -551,7 +854,7 @@ def get_kernel_template_params(the_file, KernelDictionary):
             for arg_idx, arg in enumerate(arguments_string):
                 for i in range(len(arg)-1, -1, -1):
                     if arg[i] == "*" or arg[i] == " ":
-                        argument_types[arg_idx] = re.sub(' +',' ', arg[0:i+1].replace("\n", "").strip())
+                        argument_types[arg_idx] = " ".join(part for part in arg[0:i+1].replace("\n", "").strip().split(" ") if part)
                         break
             if len(template_arguments) == 1 and template_arguments[0].strip() in ["Dtype", "T"]:
                 # Updates kernel
@@ -673,10 +976,12 @@ def extract_arguments(start, string):
 def add_static_casts(directory, extensions, KernelTemplateParams):
     """Added necessary static casts to kernel launches due to issue in HIP"""
     # Add static_casts<> to all kernel launches.
+    suffixes = extension_suffixes(extensions)
     for (dirpath, _dirnames, filenames) in os.walk(directory):
         for filename in filenames:
-            if filename_ends_with_extension(filename, extensions):
-                filepath = os.sep.join([dirpath, filename])
+            if filename.endswith(suffixes):
+                filepath = os.path.join(dirpath, filename)
+                path_components = filepath.split("/")
                 with openf(filepath, "r+") as fileobj:
                     input_source = fileobj.read()
                     new_output_source = input_source
@@ -708,12 +1013,12 @@ def add_static_casts(directory, extensions, KernelTemplateParams):
                                         static_argument = arg.replace(the_arg, static_argument)
 
                                         # Update to static_cast
-                                        new_kernel_launch = re.sub(r'\b(%s)\b' % arg, lambda x: static_argument, new_kernel_launch)
+                                        new_kernel_launch = re.sub(r'\b(%s)\b' % arg, escape_replacement(static_argument), new_kernel_launch)
 
                             # Add template type
-                            if "THCUNN" in filepath.split("/") and "generic" not in filepath.split("/"):
+                            if "THCUNN" in path_components and "generic" not in path_components:
                                 kernel_name_with_template = kernel_name_with_template.replace("<real>", "<Dtype>")
-                            new_kernel_launch = re.sub(r'\b(%s)\b' % kernel_name, lambda x: kernel_name_with_template, new_kernel_launch)
+                            new_kernel_launch = re.sub(r'\b(%s)\b' % kernel_name, escape_replacement(kernel_name_with_template), new_kernel_launch)
 
 
                             # Replace Launch
@@ -729,6 +1034,31 @@ def add_static_casts(directory, extensions, KernelTemplateParams):
                     os.fsync(fileobj)
 
 
+def copy_project(source, destination):
+    """
+    Copies the project tree, cloning files copy-on-write where the filesystem allows it.
+
+    Like shutil.copytree, symlinks are dereferenced so that the copy holds real files. Otherwise
+    preprocessing a linked file would overwrite its target outside the output directory.
+    """
+    if sys.platform.startswith("linux"):
+        command = ["cp", "-R", "-L", "--preserve=mode,timestamps", "--reflink=auto", source, destination]
+    elif sys.platform == "darwin":
+        command = ["cp", "-R", "-L", "-p", "-c", source, destination]
+    else:
+        command = None
+
+    if command is not None:
+        try:
+            subprocess.check_call(command)
+            return
+        except (OSError, subprocess.CalledProcessError):
+            # Discard any partial copy before falling back.
+            shutil.rmtree(destination, ignore_errors=True)
+
+    shutil.copytree(source, destination)
+
+
 def main():
     """Example invocation
 
@@ -780,6 +1110,13 @@ def main():
         help="The yaml file storing information for disabled functions and modules.",
         required=False)
 
+    parser.add_argument(
+        '--cache-directory',
+        type=str,
+        default="",
+        help="The directory caching hipified files so that unchanged files are skipped on later runs.",
+        required=False)
+
     parser.add_argument(
         '--add-static-casts',
         type=bool,
@@ -806,18 +1143,14 @@ def main():
 
     # Copy from project directory to output directory if not done already.
     if not os.path.exists(args.output_directory):
-        shutil.copytree(args.project_directory, args.output_directory)
+        copy_project(args.project_directory, args.output_directory)
 
     # Extract all of the kernel parameter and template type information.
     if args.add_static_casts:
         KernelTemplateParams = {}
-        for (dirpath, _dirnames, filenames) in os.walk(args.output_directory):
-            for filename in filenames:
-                if filename_ends_with_extension(filename, args.extensions) and inside_included_directories(dirpath, args.output_directory, args.include_dirs):
-                    the_file = os.sep.join([dirpath, filename])
-
-                    # Store param information inside KernelTemplateParams
-                    get_kernel_template_params(the_file, KernelTemplateParams)
+        for the_file in iter_files(args.output_directory, extension_suffixes(args.extensions), args.include_dirs):
+            # Store param information inside KernelTemplateParams
+            get_kernel_template_params(the_file, KernelTemplateParams)
 
     # Open YAML file with disable information.
     if args.yaml_settings != "":
@@ -909,12 +1242,17 @@ def main():
                 f.truncate()
                 f.close()
 
+    # Make sure the cache directory exists.
+    if args.cache_directory != "" and not os.path.exists(args.cache_directory):
+        os.makedirs(args.cache_directory)
+
     # Start Preprocessor
     walk_over_directory(
         args.output_directory,
         extensions=args.extensions,
         show_detailed=args.show_detailed,
-        include_dirs=args.include_dirs)
+        include_dirs=args.include_dirs,
+        cache_directory=args.cache_directory)
 
     if args.add_static_casts:
         # Execute the Clang Tool to Automatically add static casts